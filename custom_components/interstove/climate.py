@@ -9,19 +9,32 @@ from __future__ import annotations
 import asyncio
 import datetime
 import logging
+import math
 import socket
 from typing import Any
 
 from homeassistant.components.climate import (
+    PRESET_AWAY,
+    PRESET_COMFORT,
+    PRESET_ECO,
+    PRESET_NONE,
     ClimateEntity,
     ClimateEntityFeature,
     HVACAction,
     HVACMode,
 )
-from homeassistant.const import ATTR_TEMPERATURE, UnitOfTemperature
-from homeassistant.core import HomeAssistant
+from homeassistant.const import (
+    ATTR_TEMPERATURE,
+    EVENT_STATE_REPORTED,
+    UnitOfTemperature,
+)
+from homeassistant.core import Event, HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.event import (
+    async_track_point_in_time,
+    async_track_time_interval,
+)
+from homeassistant.util import dt as dt_util
 
 from .const import (
     DOMAIN,
@@ -31,20 +44,37 @@ from .const import (
     CONF_SCAN_INTERVAL,
     CONF_TEMP_SOURCE,
     CONF_TEMP_ENTITY,
+    CONF_TEMP_ENTITIES,
+    CONF_TEMP_WEIGHTS,
+    CONF_TEMP_MAX_AGE,
     CONF_DELAI_RALLUMAGE,
     CONF_PUISSANCE_MIN,
     CONF_PUISSANCE_MAX,
     CONF_HYSTERESIS,
+    CONF_TEMP_CONFORT,
+    CONF_TEMP_ECO,
+    CONF_TEMP_ABSENT,
+    CONF_PROGRAMME,
     DEFAULT_PORT,
     DEFAULT_SCAN_INTERVAL,
     DEFAULT_DELAI_RALLUMAGE,
     DEFAULT_PUISSANCE_MIN,
     DEFAULT_PUISSANCE_MAX,
     DEFAULT_HYSTERESIS,
+    DEFAULT_TEMP_WEIGHT,
+    DEFAULT_TEMP_MAX_AGE,
     DEFAULT_MIN_TEMP,
     DEFAULT_MAX_TEMP,
+    DEFAULT_TEMP_CONFORT,
+    DEFAULT_TEMP_ECO,
+    DEFAULT_TEMP_ABSENT,
+    DEFAULT_PROGRAMME,
+    PRECHAUFFE_FENETRE,
+    PRECHAUFFE_LISSAGE,
+    PRECHAUFFE_MAX,
     TEMP_SOURCE_INTERNE,
     TEMP_SOURCE_ZIGBEE,
+    TEMP_SOURCE_MULTI,
     TRAME_START,
     TRAME_END,
     CMD_STATUS,
@@ -56,9 +86,15 @@ from .const import (
     ETAT_ALLUME,
     ETAT_ALLUMAGE,
     ETATS_REFROIDISSEMENT,
+    ACK,
+    REPONSE_MIN_LEN,
+    TEMP_PLAUSIBLE_MIN,
+    TEMP_PLAUSIBLE_MAX,
     TCP_TIMEOUT,
     TCP_BUFFER_SIZE,
 )
+from .programmation import Programme, parser_programme
+from .temperature import AgregateurTemperature
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -84,8 +120,10 @@ class InterstoveClimate(ClimateEntity):
     _attr_supported_features = (
         ClimateEntityFeature.TARGET_TEMPERATURE
         | ClimateEntityFeature.FAN_MODE
+        | ClimateEntityFeature.PRESET_MODE
     )
     _attr_fan_modes = ["1", "2", "3", "4", "5"]
+    _attr_preset_modes = [PRESET_NONE, PRESET_COMFORT, PRESET_ECO, PRESET_AWAY]
     _attr_min_temp = DEFAULT_MIN_TEMP
     _attr_max_temp = DEFAULT_MAX_TEMP
     _attr_target_temperature_step = 1.0
@@ -102,17 +140,47 @@ class InterstoveClimate(ClimateEntity):
         self._temp_entity      = config.get(CONF_TEMP_ENTITY)
         self._delai_rallumage  = config.get(CONF_DELAI_RALLUMAGE, DEFAULT_DELAI_RALLUMAGE)
         self._puissance_min    = config.get(CONF_PUISSANCE_MIN, DEFAULT_PUISSANCE_MIN)
-        self._puissance_max    = config.get(CONF_PUISSANCE_MAX, DEFAULT_PUISSANCE_MAX)
+        self._puissance_max    = max(
+            self._puissance_min,
+            config.get(CONF_PUISSANCE_MAX, DEFAULT_PUISSANCE_MAX),
+        )
         self._hysteresis       = config.get(CONF_HYSTERESIS, DEFAULT_HYSTERESIS)
 
+        # Agrégation multi-pièces (sondes pondérées)
+        self._agregateur       = None
+        self._repli_sonde_interne = False
+        if self._temp_source == TEMP_SOURCE_MULTI:
+            entites = config.get(CONF_TEMP_ENTITIES, [])
+            poids   = config.get(CONF_TEMP_WEIGHTS) or [DEFAULT_TEMP_WEIGHT] * len(entites)
+            self._agregateur = AgregateurTemperature(
+                dict(zip(entites, poids)),
+                config.get(CONF_TEMP_MAX_AGE, DEFAULT_TEMP_MAX_AGE),
+            )
+
+        # Presets et programmation hebdomadaire
+        self._presets          = {
+            PRESET_COMFORT: config.get(CONF_TEMP_CONFORT, DEFAULT_TEMP_CONFORT),
+            PRESET_ECO:     config.get(CONF_TEMP_ECO, DEFAULT_TEMP_ECO),
+            PRESET_AWAY:    config.get(CONF_TEMP_ABSENT, DEFAULT_TEMP_ABSENT),
+        }
+        self._programme        = Programme(parser_programme(
+            config.get(CONF_PROGRAMME, DEFAULT_PROGRAMME), list(self._presets)
+        ))
+        self._preset           = PRESET_NONE
+        self._prochaine_transition = None
+        self._transition_appliquee = None
+        self._annule_timer     = None
+        self._vitesse_chauffe  = None   # °C/h observés pendant la chauffe
+        self._mesure_chauffe   = None   # (horodatage, température) de référence
+
         # États internes
         self._hvac_mode        = HVACMode.OFF
         self._hvac_action      = HVACAction.OFF
         self._current_temp     = None
         self._target_temp      = 20.0
-        self._fan_mode         = "3"
         self._etat_poele       = None
-        self._puissance        = 3
+        self._puissance        = max(self._puissance_min, min(self._puissance_max, 3))
+        self._fan_mode         = str(self._puissance)
         self._heure_extinction = None
         self._available        = False
 
@@ -127,6 +195,27 @@ class InterstoveClimate(ClimateEntity):
 
     async def async_added_to_hass(self) -> None:
         """Démarrage de la mise à jour périodique."""
+        if self._agregateur is not None:
+            for entity_id in self._agregateur.entites:
+                self._maj_sonde(entity_id, self.hass.states.get(entity_id))
+            # Depuis HA 2024.5, un écouteur EVENT_STATE_REPORTED reçoit aussi
+            # les changements d'état : un seul abonnement couvre les nouvelles
+            # valeurs et les valeurs republiées (qui rafraîchissent l'horodatage)
+            self.async_on_remove(
+                self.hass.bus.async_listen(
+                    EVENT_STATE_REPORTED,
+                    self._async_sonde_changed,
+                    event_filter=self._filtre_sonde,
+                )
+            )
+
+        if self._programme:
+            preset = self._programme.preset_actif(dt_util.now())
+            self._preset = preset
+            self._target_temp = self._presets[preset]
+            self._armer_programme()
+            self.async_on_remove(self._annuler_timer)
+
         await self.async_update()
         async_track_time_interval(
             self.hass,
@@ -139,6 +228,43 @@ class InterstoveClimate(ClimateEntity):
         await self.async_update()
         self.async_write_ha_state()
 
+    @callback
+    def _async_sonde_changed(self, event: Event) -> None:
+        """Mise à jour incrémentale de la température effective."""
+        self._maj_sonde(event.data["entity_id"], event.data.get("new_state"))
+        temp = self._agregateur.temperature(dt_util.utcnow())
+        # Sans sonde à jour, la valeur de repli (sonde interne) est conservée
+        if temp is not None and temp != self._current_temp:
+            self._current_temp = temp
+            self.async_write_ha_state()
+
+    @callback
+    def _filtre_sonde(self, event_data) -> bool:
+        """Ne retient que les événements des sondes agrégées."""
+        return event_data["entity_id"] in self._agregateur.entites
+
+    def _maj_sonde(self, entity_id: str, state) -> None:
+        """Transmet l'état d'une sonde à l'agrégateur."""
+        valeur = None
+        horodatage = dt_util.utcnow()
+        if state is not None and state.state not in ("unavailable", "unknown"):
+            try:
+                valeur = float(state.state)
+            except ValueError:
+                _LOGGER.warning(
+                    "Valeur invalide pour %s: %s", entity_id, state.state
+                )
+            else:
+                if math.isfinite(valeur):
+                    # last_reported avance aussi quand la valeur est republiée
+                    horodatage = state.last_reported
+                else:
+                    _LOGGER.warning(
+                        "Valeur non finie pour %s: %s", entity_id, state.state
+                    )
+                    valeur = None
+        self._agregateur.mettre_a_jour(entity_id, valeur, horodatage)
+
     # ─────────────────────────────────────────
     # Propriétés HA
     # ─────────────────────────────────────────
@@ -167,6 +293,10 @@ class InterstoveClimate(ClimateEntity):
     def fan_mode(self) -> str:
         return self._fan_mode
 
+    @property
+    def preset_mode(self) -> str:
+        return self._preset
+
     @property
     def extra_state_attributes(self) -> dict:
         """Attributs supplémentaires exposés dans HA."""
@@ -179,6 +309,16 @@ class InterstoveClimate(ClimateEntity):
                 self._heure_extinction.isoformat()
                 if self._heure_extinction else None
             ),
+            "prochaine_transition": (
+                f"{self._prochaine_transition[0].isoformat()} "
+                f"{self._prochaine_transition[1]}"
+                if self._prochaine_transition else None
+            ),
+            "vitesse_chauffe": self._vitesse_chauffe,
+            "sondes_actives": (
+                self._agregateur.sondes_actives
+                if self._agregateur is not None else None
+            ),
         }
 
     # ─────────────────────────────────────────
@@ -207,15 +347,25 @@ class InterstoveClimate(ClimateEntity):
         """Mise à jour de la consigne de température."""
         temp = kwargs.get(ATTR_TEMPERATURE)
         if temp is not None:
-            self._target_temp = temp
-            await self._reguler_puissance()
+            # Consigne manuelle : le preset est abandonné jusqu'à la prochaine transition
+            self._preset = PRESET_NONE
+            if temp != self._target_temp:
+                self._target_temp = temp
+                await self._reguler_puissance()
             self.async_write_ha_state()
 
+    async def async_set_preset_mode(self, preset_mode: str) -> None:
+        """Application manuelle d'un preset (jusqu'à la prochaine transition)."""
+        await self._appliquer_preset(preset_mode)
+        self.async_write_ha_state()
+
     async def async_set_fan_mode(self, fan_mode: str) -> None:
         """Réglage manuel de la puissance."""
         puissance = int(fan_mode)
         puissance = max(self._puissance_min, min(self._puissance_max, puissance))
-        await self._set_puissance(puissance)
+        # Poêle arrêté : aucune trame, la puissance 1 partage la trame d'allumage
+        if self._hvac_mode == HVACMode.HEAT:
+            await self._set_puissance(puissance)
         self._fan_mode = str(puissance)
         self.async_write_ha_state()
 
@@ -243,6 +393,27 @@ class InterstoveClimate(ClimateEntity):
                 if state and state.state not in ("unavailable", "unknown"):
                     self._current_temp = float(state.state)
 
+            # Température effective multi-pièces (sondes périmées ignorées)
+            elif self._agregateur is not None:
+                temp = self._agregateur.temperature(dt_util.utcnow())
+                if temp is not None:
+                    self._current_temp = temp
+                    self._repli_sonde_interne = False
+                else:
+                    # Toutes les sondes périmées : repli sur la sonde interne
+                    # pour conserver la régulation et l'extinction automatique
+                    if not self._repli_sonde_interne:
+                        _LOGGER.warning(
+                            "Aucune sonde multi-pièces à jour → repli sur la sonde interne"
+                        )
+                        self._repli_sonde_interne = True
+                        self._current_temp = None
+                    reponse_temp = await self._send_command(CMD_TEMPERATURE)
+                    if reponse_temp:
+                        self._parse_temperature(reponse_temp)
+
+            self._observer_chauffe()
+
             # Régulation automatique si poêle allumé
             if self._hvac_mode == HVACMode.HEAT:
                 await self._reguler_puissance()
@@ -253,6 +424,116 @@ class InterstoveClimate(ClimateEntity):
             _LOGGER.error("Erreur mise à jour Interstove: %s", e)
             self._available = False
 
+    # ─────────────────────────────────────────
+    # Programmation hebdomadaire
+    # ─────────────────────────────────────────
+
+    async def _appliquer_preset(self, preset: str) -> None:
+        """Applique la consigne d'un preset, sans commande si elle est inchangée."""
+        self._preset = preset
+        consigne = self._presets.get(preset)
+        if consigne is not None and consigne != self._target_temp:
+            self._target_temp = consigne
+            await self._reguler_puissance()
+
+    @callback
+    def _armer_programme(self) -> None:
+        """Arme un timer unique sur la prochaine transition (préchauffe incluse)."""
+        self._annuler_timer()
+
+        maintenant = dt_util.now()
+        apres = maintenant
+        if self._transition_appliquee is not None:
+            apres = max(maintenant, self._transition_appliquee)
+
+        self._prochaine_transition = self._programme.prochaine_transition(apres)
+        if self._prochaine_transition is None:
+            return
+
+        heure, preset = self._prochaine_transition
+        declenchement = max(maintenant, heure - self._avance_prechauffe(preset))
+        self._annule_timer = async_track_point_in_time(
+            self.hass, self._async_transition, declenchement
+        )
+        _LOGGER.debug(
+            "Prochaine transition %s à %s (déclenchement %s)",
+            preset, heure, declenchement,
+        )
+
+    @callback
+    def _annuler_timer(self) -> None:
+        """Annule le timer de transition en cours."""
+        if self._annule_timer is not None:
+            self._annule_timer()
+            self._annule_timer = None
+
+    async def _async_transition(self, now=None) -> None:
+        """Transition programmée : application du preset puis réarmement."""
+        self._annule_timer = None
+        heure, preset = self._prochaine_transition
+        self._transition_appliquee = heure
+        _LOGGER.info("Programme → preset %s (transition de %s)", preset, heure)
+        await self._appliquer_preset(preset)
+        self._armer_programme()
+        self.async_write_ha_state()
+
+    def _avance_prechauffe(self, preset: str) -> datetime.timedelta:
+        """
+        Anticipation nécessaire pour atteindre la consigne du preset à l'heure.
+
+        La température de départ est estimée à la plus basse entre la mesure
+        actuelle et la consigne en vigueur (la pièce redescend vers celle-ci).
+        """
+        consigne = self._presets.get(preset)
+        if consigne is None or not self._vitesse_chauffe:
+            return datetime.timedelta(0)
+
+        depart = self._target_temp
+        if self._current_temp is not None:
+            depart = min(self._current_temp, self._target_temp)
+
+        ecart = consigne - depart
+        if ecart <= 0:
+            return datetime.timedelta(0)
+        secondes = min(ecart / self._vitesse_chauffe * 3600, PRECHAUFFE_MAX)
+        return datetime.timedelta(seconds=secondes)
+
+    def _observer_chauffe(self) -> None:
+        """
+        Estime la vitesse de montée en température (°C/h) pendant la chauffe.
+
+        Seule la montée vers la consigne est mesurée : le maintien dans la
+        bande d'hystérésis, à faible puissance, sous-estimerait la vitesse.
+        """
+        if (
+            self._hvac_action != HVACAction.HEATING
+            or self._current_temp is None
+            or self._target_temp - self._current_temp <= self._hysteresis
+        ):
+            self._mesure_chauffe = None
+            return
+
+        maintenant = dt_util.utcnow()
+        if self._mesure_chauffe is None:
+            self._mesure_chauffe = (maintenant, self._current_temp)
+            return
+
+        debut, temp_debut = self._mesure_chauffe
+        secondes = (maintenant - debut).total_seconds()
+        if secondes < PRECHAUFFE_FENETRE:
+            return
+
+        self._mesure_chauffe = (maintenant, self._current_temp)
+        vitesse = (self._current_temp - temp_debut) / secondes * 3600
+        if vitesse <= 0:
+            return
+        if self._vitesse_chauffe is not None:
+            vitesse = (
+                PRECHAUFFE_LISSAGE * vitesse
+                + (1 - PRECHAUFFE_LISSAGE) * self._vitesse_chauffe
+            )
+        self._vitesse_chauffe = round(vitesse, 2)
+
     # ─────────────────────────────────────────
     # Régulation intelligente
     # ─────────────────────────────────────────
@@ -271,9 +552,10 @@ class InterstoveClimate(ClimateEntity):
                 await self.async_set_hvac_mode(HVACMode.OFF)
             return
 
-        # Allumage automatique si nécessaire
-        if self._hvac_mode == HVACMode.OFF and ecart > self._hysteresis:
-            if self._check_delai_rallumage():
+        # Allumage automatique si nécessaire. Poêle arrêté : aucune commande
+        # de puissance (la puissance 1 partage la trame d'allumage)
+        if self._hvac_mode == HVACMode.OFF:
+            if ecart > self._hysteresis and self._check_delai_rallumage():
                 _LOGGER.info("Écart %.1f°C → Allumage automatique", ecart)
                 await self.async_set_hvac_mode(HVACMode.HEAT)
             return
@@ -335,6 +617,7 @@ class InterstoveClimate(ClimateEntity):
 
     def _parse_statut(self, reponse: str) -> None:
         """Parse la réponse de statut du poêle."""
+        etat_precedent = self._etat_poele
         self._etat_poele = reponse
 
         if reponse == ETAT_ETEINT:
@@ -347,6 +630,15 @@ class InterstoveClimate(ClimateEntity):
             self._hvac_mode   = HVACMode.HEAT
             self._hvac_action = HVACAction.PREHEATING
         elif reponse in ETATS_REFROIDISSEMENT:
+            # Extinction non commandée par HA (panneau, redémarrage) :
+            # le délai de sécurité démarre à la sortie d'un état de marche.
+            # Une extinction commandée par HA (mode déjà OFF) a son propre
+            # horodatage, et une trame inconnue ne relance pas le délai.
+            if self._heure_extinction is None or (
+                etat_precedent in (ETAT_ALLUME, ETAT_ALLUMAGE)
+                and self._hvac_mode == HVACMode.HEAT
+            ):
+                self._heure_extinction = datetime.datetime.now()
             self._hvac_mode   = HVACMode.OFF
             self._hvac_action = HVACAction.COOLING
         else:
@@ -357,13 +649,25 @@ class InterstoveClimate(ClimateEntity):
         Parse la réponse de température.
         Format : XXXX00YY → valeur hex / 10 = température en °C
         Exemple : 00E9003E → 0xE9 = 233 → 233/10 = 23.3°C
+
+        Une trame tronquée, un acquittement ou une valeur hors plage est
+        ignoré : la dernière température valide est conservée.
         """
+        if len(reponse) < REPONSE_MIN_LEN or reponse == ACK:
+            _LOGGER.warning("Réponse température invalide ignorée: %r", reponse)
+            return
+
         try:
-            valeur_hex = reponse[:4]
-            valeur_dec = int(valeur_hex, 16)
-            self._current_temp = round(valeur_dec / 10, 1)
-        except (ValueError, IndexError) as e:
-            _LOGGER.error("Erreur parsing température: %s", e)
+            valeur_dec = int(reponse[:4], 16)
+        except ValueError:
+            _LOGGER.warning("Réponse température invalide ignorée: %r", reponse)
+            return
+
+        temperature = round(valeur_dec / 10, 1)
+        if not TEMP_PLAUSIBLE_MIN <= temperature <= TEMP_PLAUSIBLE_MAX:
+            _LOGGER.warning("Température hors plage ignorée: %.1f°C", temperature)
+            return
+        self._current_temp = temperature
 
     # ─────────────────────────────────────────
     # Communication TCP
@@ -13,6 +13,7 @@ from typing import Any
 import voluptuous as vol
 
 from homeassistant import config_entries
+from homeassistant.components.climate import PRESET_AWAY, PRESET_COMFORT, PRESET_ECO
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResult
 import homeassistant.helpers.config_validation as cv
@@ -25,27 +26,43 @@ from .const import (
     CONF_BRIDGE_TYPE,
     CONF_TEMP_SOURCE,
     CONF_TEMP_ENTITY,
+    CONF_TEMP_ENTITIES,
+    CONF_TEMP_WEIGHTS,
+    CONF_TEMP_MAX_AGE,
     CONF_DELAI_RALLUMAGE,
     CONF_PUISSANCE_MIN,
     CONF_PUISSANCE_MAX,
     CONF_HYSTERESIS,
+    CONF_TEMP_CONFORT,
+    CONF_TEMP_ECO,
+    CONF_TEMP_ABSENT,
+    CONF_PROGRAMME,
     DEFAULT_PORT,
     DEFAULT_SCAN_INTERVAL,
     DEFAULT_DELAI_RALLUMAGE,
     DEFAULT_PUISSANCE_MIN,
     DEFAULT_PUISSANCE_MAX,
     DEFAULT_HYSTERESIS,
+    DEFAULT_TEMP_MAX_AGE,
+    DEFAULT_MIN_TEMP,
+    DEFAULT_MAX_TEMP,
+    DEFAULT_TEMP_CONFORT,
+    DEFAULT_TEMP_ECO,
+    DEFAULT_TEMP_ABSENT,
+    DEFAULT_PROGRAMME,
     BRIDGE_ESPLINK,
     BRIDGE_ESPHOME,
     BRIDGE_TYPES,
     TEMP_SOURCE_INTERNE,
     TEMP_SOURCE_ZIGBEE,
+    TEMP_SOURCE_MULTI,
     TEMP_SOURCES,
     TCP_TIMEOUT,
     TRAME_START,
     CMD_STATUS,
     TRAME_END,
 )
+from .programmation import parser_programme
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -64,6 +81,11 @@ async def _test_connection(host: str, port: int) -> bool:
         return False
 
 
+def _split_liste(valeur: str) -> list[str]:
+    """Découpe une liste saisie sous forme « a, b, c »."""
+    return [element.strip() for element in valeur.split(",") if element.strip()]
+
+
 class InterstoveConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Flux de configuration de l'intégration Interstove."""
 
@@ -117,6 +139,10 @@ class InterstoveConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             if user_input[CONF_TEMP_SOURCE] == TEMP_SOURCE_ZIGBEE:
                 return await self.async_step_zigbee()
 
+            # Si multi-pièces, demander les sondes et leurs poids
+            if user_input[CONF_TEMP_SOURCE] == TEMP_SOURCE_MULTI:
+                return await self.async_step_multi()
+
             return await self.async_step_regulation()
 
         schema = vol.Schema({
@@ -155,16 +181,65 @@ class InterstoveConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             errors=errors,
         )
 
+    async def async_step_multi(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Étape 3 (optionnelle) : Sondes multi-pièces pondérées."""
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            entites = _split_liste(user_input.get(CONF_TEMP_ENTITIES, ""))
+            poids_saisis = _split_liste(user_input.get(CONF_TEMP_WEIGHTS, ""))
+
+            # Vérification que toutes les entités existent dans HA
+            if not entites or any(
+                self.hass.states.get(entity) is None for entity in entites
+            ):
+                errors[CONF_TEMP_ENTITIES] = "entity_not_found"
+
+            # Un poids positif par entité (optionnel : 1 par défaut)
+            poids: list[float] = []
+            try:
+                poids = [float(valeur) for valeur in poids_saisis]
+            except ValueError:
+                errors[CONF_TEMP_WEIGHTS] = "invalid_weights"
+            if poids and (len(poids) != len(entites) or min(poids) <= 0):
+                errors[CONF_TEMP_WEIGHTS] = "invalid_weights"
+
+            if not errors:
+                self._data.update({
+                    CONF_TEMP_ENTITIES: entites,
+                    CONF_TEMP_WEIGHTS: poids,
+                    CONF_TEMP_MAX_AGE: user_input[CONF_TEMP_MAX_AGE],
+                })
+                return await self.async_step_regulation()
+
+        schema = vol.Schema({
+            vol.Required(CONF_TEMP_ENTITIES): str,
+            vol.Optional(CONF_TEMP_WEIGHTS, default=""): str,
+            vol.Required(CONF_TEMP_MAX_AGE, default=DEFAULT_TEMP_MAX_AGE): vol.All(
+                vol.Coerce(int), vol.Range(min=1)
+            ),
+        })
+
+        return self.async_show_form(
+            step_id="multi",
+            data_schema=schema,
+            errors=errors,
+        )
+
     async def async_step_regulation(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Étape 4 : Paramètres de régulation."""
+        errors: dict[str, str] = {}
+
         if user_input is not None:
-            self._data.update(user_input)
-            return self.async_create_entry(
-                title=f"Poêle Pellets ({self._data[CONF_HOST]})",
-                data=self._data,
-            )
+            if user_input[CONF_PUISSANCE_MIN] > user_input[CONF_PUISSANCE_MAX]:
+                errors[CONF_PUISSANCE_MAX] = "invalid_power_range"
+            else:
+                self._data.update(user_input)
+                return await self.async_step_programmation()
 
         schema = vol.Schema({
             vol.Required(CONF_PUISSANCE_MIN, default=DEFAULT_PUISSANCE_MIN): vol.In([1, 2, 3, 4, 5]),
@@ -176,4 +251,48 @@ class InterstoveConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         return self.async_show_form(
             step_id="regulation",
             data_schema=schema,
+            errors=errors,
+        )
+
+    async def async_step_programmation(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Étape 5 : Presets et programme hebdomadaire."""
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            try:
+                parser_programme(
+                    user_input.get(CONF_PROGRAMME, ""),
+                    [PRESET_COMFORT, PRESET_ECO, PRESET_AWAY],
+                )
+            except ValueError:
+                errors[CONF_PROGRAMME] = "invalid_schedule"
+            else:
+                self._data.update(user_input)
+                return self.async_create_entry(
+                    title=f"Poêle Pellets ({self._data[CONF_HOST]})",
+                    data=self._data,
+                )
+
+        schema = vol.Schema({
+            vol.Required(CONF_TEMP_CONFORT, default=DEFAULT_TEMP_CONFORT): vol.All(
+                vol.Coerce(float),
+                vol.Range(min=DEFAULT_MIN_TEMP, max=DEFAULT_MAX_TEMP),
+            ),
+            vol.Required(CONF_TEMP_ECO, default=DEFAULT_TEMP_ECO): vol.All(
+                vol.Coerce(float),
+                vol.Range(min=DEFAULT_MIN_TEMP, max=DEFAULT_MAX_TEMP),
+            ),
+            vol.Required(CONF_TEMP_ABSENT, default=DEFAULT_TEMP_ABSENT): vol.All(
+                vol.Coerce(float),
+                vol.Range(min=DEFAULT_MIN_TEMP, max=DEFAULT_MAX_TEMP),
+            ),
+            vol.Optional(CONF_PROGRAMME, default=DEFAULT_PROGRAMME): str,
+        })
+
+        return self.async_show_form(
+            step_id="programmation",
+            data_schema=schema,
+            errors=errors,
         )
@@ -19,10 +19,17 @@ CONF_SCAN_INTERVAL     = "scan_interval"
 CONF_BRIDGE_TYPE       = "bridge_type"
 CONF_TEMP_SOURCE       = "temp_source"
 CONF_TEMP_ENTITY       = "temp_entity"
+CONF_TEMP_ENTITIES     = "temp_entities"
+CONF_TEMP_WEIGHTS      = "temp_weights"
+CONF_TEMP_MAX_AGE      = "temp_max_age"
 CONF_DELAI_RALLUMAGE   = "delai_rallumage"
 CONF_PUISSANCE_MIN     = "puissance_min"
 CONF_PUISSANCE_MAX     = "puissance_max"
 CONF_HYSTERESIS        = "hysteresis"
+CONF_TEMP_CONFORT      = "temp_confort"
+CONF_TEMP_ECO          = "temp_eco"
+CONF_TEMP_ABSENT       = "temp_absent"
+CONF_PROGRAMME         = "programme"
 
 # ─────────────────────────────────────────
 # Valeurs par défaut
@@ -34,8 +41,14 @@ DEFAULT_DELAI_RALLUMAGE  = 1800     # secondes (30 min)
 DEFAULT_PUISSANCE_MIN    = 1
 DEFAULT_PUISSANCE_MAX    = 5
 DEFAULT_HYSTERESIS       = 0.5      # °C
+DEFAULT_TEMP_WEIGHT      = 1.0
+DEFAULT_TEMP_MAX_AGE     = 1800     # secondes (30 min)
 DEFAULT_MIN_TEMP         = 15.0     # °C
 DEFAULT_MAX_TEMP         = 30.0     # °C
+DEFAULT_TEMP_CONFORT     = 20.0     # °C
+DEFAULT_TEMP_ECO         = 17.0     # °C
+DEFAULT_TEMP_ABSENT      = 15.0     # °C
+DEFAULT_PROGRAMME        = ""       # Aucun programme hebdomadaire
 
 # ─────────────────────────────────────────
 # Types de bridge
@@ -52,8 +65,20 @@ BRIDGE_TYPES = [BRIDGE_ESPLINK, BRIDGE_ESPHOME]
 
 TEMP_SOURCE_INTERNE = "interne"   # Sonde interne du poêle
 TEMP_SOURCE_ZIGBEE  = "zigbee"    # Sonde Zigbee externe
+TEMP_SOURCE_MULTI   = "multi"     # Plusieurs sondes pondérées (multi-pièces)
 
-TEMP_SOURCES = [TEMP_SOURCE_INTERNE, TEMP_SOURCE_ZIGBEE]
+TEMP_SOURCES = [TEMP_SOURCE_INTERNE, TEMP_SOURCE_ZIGBEE, TEMP_SOURCE_MULTI]
+
+# ─────────────────────────────────────────
+# Programmation hebdomadaire
+# ─────────────────────────────────────────
+
+# Jours acceptés dans le programme (lundi = 0)
+JOURS_SEMAINE = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+
+PRECHAUFFE_FENETRE = 900    # secondes entre deux mesures de vitesse de chauffe
+PRECHAUFFE_LISSAGE = 0.3    # coefficient de lissage de la vitesse de chauffe
+PRECHAUFFE_MAX     = 7200   # secondes (2 h) d'anticipation au maximum
 
 # ─────────────────────────────────────────
 # Protocole série du poêle
@@ -72,6 +97,13 @@ CMD_EXTINCTION  = "RF000058"     # Extinction
 # Réponse acquittement
 ACK = "00000020"
 
+# Taille minimale d'une réponse (4 octets → 8 caractères hexadécimaux)
+REPONSE_MIN_LEN = 8
+
+# Plage plausible de température ambiante lue sur la sonde interne
+TEMP_PLAUSIBLE_MIN = 0.0    # °C
+TEMP_PLAUSIBLE_MAX = 60.0   # °C
+
 # ─────────────────────────────────────────
 # États du poêle
 # ─────────────────────────────────────────
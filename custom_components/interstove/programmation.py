@@ -0,0 +1,119 @@
+"""
+Interstove HA - Programmation hebdomadaire
+Précalcul des transitions de preset (confort, éco, absent) sur la semaine.
+"""
+
+from __future__ import annotations
+
+import bisect
+import datetime
+import re
+
+from .const import JOURS_SEMAINE
+
+MINUTES_JOUR = 24 * 60
+
+# Horaire strict HH:MM (chiffres ASCII uniquement)
+HORAIRE = re.compile(r"(\d{2}):(\d{2})", re.ASCII)
+
+
+def parser_programme(
+    texte: str, presets: list[str]
+) -> list[tuple[int, str]]:
+    """
+    Parse un programme hebdomadaire.
+
+    Une entrée par ligne ou séparée par « ; » : <jours> HH:MM <preset>
+    Exemple : mon-fri 06:30 comfort; mon-fri 22:00 eco; sat,sun 08:00 comfort
+
+    Retourne la liste des transitions (minute de la semaine, preset).
+    Lève ValueError si le programme est invalide.
+    """
+    transitions: dict[int, str] = {}
+
+    for entree in texte.replace("\n", ";").split(";"):
+        if not entree.strip():
+            continue
+        try:
+            jours, horaire, preset = entree.split()
+        except ValueError as e:
+            raise ValueError(f"Entrée de programme invalide : {entree!r}") from e
+
+        if preset not in presets:
+            raise ValueError(f"Preset inconnu : {preset!r}")
+        correspondance = HORAIRE.fullmatch(horaire)
+        if correspondance is None:
+            raise ValueError(f"Horaire invalide : {horaire!r}")
+        heures, minutes = (int(valeur) for valeur in correspondance.groups())
+        if not (heures < 24 and minutes < 60):
+            raise ValueError(f"Horaire invalide : {horaire!r}")
+
+        for jour in _parser_jours(jours):
+            transitions[jour * MINUTES_JOUR + heures * 60 + minutes] = preset
+
+    return sorted(transitions.items())
+
+
+def _parser_jours(jours: str) -> list[int]:
+    """Parse « mon », « mon-fri » ou « sat,sun » en indices de jours."""
+    indices: list[int] = []
+    for groupe in jours.lower().split(","):
+        debut, _, fin = groupe.partition("-")
+        if debut not in JOURS_SEMAINE or (fin and fin not in JOURS_SEMAINE):
+            raise ValueError(f"Jours invalides : {jours!r}")
+        i_debut = JOURS_SEMAINE.index(debut)
+        i_fin = JOURS_SEMAINE.index(fin) if fin else i_debut
+        indices.extend(
+            jour % 7 for jour in range(i_debut, i_debut + (i_fin - i_debut) % 7 + 1)
+        )
+    return indices
+
+
+class Programme:
+    """
+    Programme hebdomadaire précalculé.
+
+    Les transitions sont triées une fois pour toutes par minute de la semaine :
+    la prochaine transition s'obtient par recherche dichotomique, ce qui permet
+    d'armer un unique timer au lieu d'interroger le programme à chaque cycle.
+    """
+
+    def __init__(self, transitions: list[tuple[int, str]]) -> None:
+        """Initialisation du programme."""
+        self._transitions = sorted(transitions)
+        self._minutes = [minute for minute, _ in self._transitions]
+
+    def __bool__(self) -> bool:
+        return bool(self._transitions)
+
+    def preset_actif(self, maintenant: datetime.datetime) -> str | None:
+        """Preset de la dernière transition passée (le programme boucle)."""
+        if not self._transitions:
+            return None
+        index = bisect.bisect_right(self._minutes, _minute_semaine(maintenant))
+        return self._transitions[index - 1][1]
+
+    def prochaine_transition(
+        self, apres: datetime.datetime
+    ) -> tuple[datetime.datetime, str] | None:
+        """Première transition strictement postérieure à `apres`."""
+        if not self._transitions:
+            return None
+
+        debut_semaine = apres.replace(
+            hour=0, minute=0, second=0, microsecond=0
+        ) - datetime.timedelta(days=apres.weekday())
+
+        index = bisect.bisect_right(self._minutes, _minute_semaine(apres))
+        if index == len(self._transitions):
+            # Bouclage sur la semaine suivante
+            index = 0
+            debut_semaine += datetime.timedelta(days=7)
+
+        minute, preset = self._transitions[index]
+        return debut_semaine + datetime.timedelta(minutes=minute), preset
+
+
+def _minute_semaine(instant: datetime.datetime) -> int:
+    """Minute de la semaine (lundi 00:00 = 0)."""
+    return instant.weekday() * MINUTES_JOUR + instant.hour * 60 + instant.minute
@@ -0,0 +1,98 @@
+"""
+Interstove HA - Agrégation de température multi-pièces
+Calcule une température effective pondérée à partir de plusieurs sondes.
+"""
+
+from __future__ import annotations
+
+import datetime
+import logging
+import math
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class AgregateurTemperature:
+    """
+    Moyenne pondérée glissante de plusieurs sondes de température.
+
+    Les sommes pondérées sont mises à jour à chaque événement (retrait de
+    l'ancienne contribution, ajout de la nouvelle) : la température effective
+    n'est jamais recalculée depuis zéro. Une sonde qui n'a pas été mise à jour
+    depuis plus de `age_max` secondes est retirée de la moyenne.
+    """
+
+    def __init__(self, poids: dict[str, float], age_max: float) -> None:
+        """Initialisation de l'agrégateur."""
+        self._poids = dict(poids)
+        self._entites = frozenset(self._poids)
+        self._age_max = datetime.timedelta(seconds=age_max)
+
+        # entity_id → (valeur, poids, horodatage)
+        self._sondes: dict[str, tuple[float, float, datetime.datetime]] = {}
+        self._somme_ponderee = 0.0
+        self._somme_poids = 0.0
+
+    @property
+    def entites(self) -> frozenset[str]:
+        """Entités suivies par l'agrégateur (test d'appartenance en O(1))."""
+        return self._entites
+
+    @property
+    def sondes_actives(self) -> int:
+        """Nombre de sondes contribuant actuellement à la moyenne."""
+        return len(self._sondes)
+
+    def mettre_a_jour(
+        self,
+        entity_id: str,
+        valeur: float | None,
+        horodatage: datetime.datetime,
+    ) -> None:
+        """
+        Remplace la contribution d'une sonde (None = sonde indisponible).
+
+        Une valeur non finie (nan, inf) est traitée comme une sonde
+        indisponible : elle contaminerait définitivement les sommes.
+        """
+        poids = self._poids.get(entity_id)
+        if poids is None:
+            return
+
+        self._retirer(entity_id)
+        if valeur is None or not math.isfinite(valeur) or poids <= 0:
+            return
+
+        self._sondes[entity_id] = (valeur, poids, horodatage)
+        self._somme_ponderee += valeur * poids
+        self._somme_poids += poids
+
+    def temperature(self, maintenant: datetime.datetime) -> float | None:
+        """Température effective, après retrait des sondes périmées."""
+        perimees = [
+            entity_id
+            for entity_id, (_, _, horodatage) in self._sondes.items()
+            if maintenant - horodatage > self._age_max
+        ]
+        for entity_id in perimees:
+            _LOGGER.debug("Sonde %s périmée → ignorée", entity_id)
+            self._retirer(entity_id)
+
+        if self._somme_poids <= 0:
+            return None
+        return round(self._somme_ponderee / self._somme_poids, 1)
+
+    def _retirer(self, entity_id: str) -> None:
+        """Retire la contribution d'une sonde des sommes pondérées."""
+        ancienne = self._sondes.pop(entity_id, None)
+        if ancienne is None:
+            return
+
+        valeur, poids, _ = ancienne
+        if not self._sondes:
+            # Remise à zéro exacte pour éviter la dérive des flottants
+            self._somme_ponderee = 0.0
+            self._somme_poids = 0.0
+        else:
+            self._somme_ponderee -= valeur * poids
+            self._somme_poids -= poids
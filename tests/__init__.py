@@ -0,0 +1 @@
+"""Tests de l'intégration Interstove HA."""
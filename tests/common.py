@@ -0,0 +1,117 @@
+"""
+Outils communs aux tests : entité climate hors Home Assistant
+et bridge ESP32 simulé sur un serveur TCP local.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+from custom_components.interstove.climate import InterstoveClimate
+from custom_components.interstove.const import (
+    ACK,
+    CMD_ALLUMAGE,
+    CMD_EXTINCTION,
+    CMD_STATUS,
+    CMD_TEMPERATURE,
+    CONF_DELAI_RALLUMAGE,
+    CONF_HOST,
+    CONF_PORT,
+    ETAT_ALLUMAGE,
+    ETAT_ALLUME,
+    ETAT_ETEINT,
+    ETAT_REFROID_1,
+    ETATS_REFROIDISSEMENT,
+    PUISSANCE_CMDS,
+    TRAME_END,
+    TRAME_START,
+)
+
+
+# Trame → puissance (la puissance 1 partage la trame d'allumage)
+PUISSANCES = {cmd: puissance for puissance, cmd in PUISSANCE_CMDS.items()}
+
+
+def creer_poele(**config) -> InterstoveClimate:
+    """Crée une entité climate utilisable sans instance Home Assistant."""
+    config.setdefault(CONF_HOST, "127.0.0.1")
+    config.setdefault(CONF_PORT, 2000)
+    poele = InterstoveClimate(None, config)
+    # Aucune machine d'états HA : l'écriture d'état est sans effet
+    poele.async_write_ha_state = lambda: None
+    return poele
+
+
+def trame_temperature(temperature: float) -> str:
+    """Réponse de température au format XXXX00YY."""
+    return f"{round(temperature * 10):04x}0000"
+
+
+class FauxBridge:
+    """
+    Bridge ESP-Link simulé : une connexion TCP par commande, comme le vrai.
+
+    Le poêle simulé passe en marche sur CMD_ALLUMAGE (s'il est arrêté) et en
+    refroidissement sur CMD_EXTINCTION. Les allumages reçus pendant le délai
+    de sécurité qui suit une extinction sont comptés dans `violations`, les
+    puissances appliquées en marche sont relevées dans `puissances`.
+    """
+
+    def __init__(self, delai_rallumage: float = 0) -> None:
+        """Initialisation du bridge simulé."""
+        self.statut = ETAT_ETEINT
+        self.temperature = 20.0
+        self.commandes: list[str] = []
+        self.violations = 0
+        self.puissances: list[int] = []
+        self.delai_rallumage = delai_rallumage
+        self._heure_extinction: float | None = None
+        self._serveur: asyncio.Server | None = None
+
+    @property
+    def port(self) -> int:
+        return self._serveur.sockets[0].getsockname()[1]
+
+    async def __aenter__(self) -> FauxBridge:
+        self._serveur = await asyncio.start_server(self._connexion, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self._serveur.close()
+        await self._serveur.wait_closed()
+
+    async def _connexion(self, reader, writer) -> None:
+        """Lit une trame <ESC>commande<&> et renvoie la réponse du poêle."""
+        trame = await reader.readuntil(TRAME_END.encode())
+        cmd = trame.decode().removeprefix(TRAME_START).removesuffix(TRAME_END)
+        self.commandes.append(cmd)
+        writer.write(bytes.fromhex(self._repondre(cmd)))
+        await writer.drain()
+        writer.close()
+
+    def _repondre(self, cmd: str) -> str:
+        """Réponse du poêle simulé à une commande."""
+        maintenant = asyncio.get_running_loop().time()
+        if cmd == CMD_STATUS:
+            return self.statut
+        if cmd == CMD_TEMPERATURE:
+            return trame_temperature(self.temperature)
+        if cmd == CMD_EXTINCTION:
+            self.statut = ETAT_REFROID_1
+            self._heure_extinction = maintenant
+        elif cmd == CMD_ALLUMAGE and self.statut in [ETAT_ETEINT, *ETATS_REFROIDISSEMENT]:
+            if (
+                self._heure_extinction is not None
+                and maintenant - self._heure_extinction < self.delai_rallumage
+            ):
+                self.violations += 1
+            self.statut = ETAT_ALLUME
+        elif cmd in PUISSANCES and self.statut in (ETAT_ALLUME, ETAT_ALLUMAGE):
+            self.puissances.append(PUISSANCES[cmd])
+        return ACK
+
+
+def creer_poele_bridge(bridge: FauxBridge, **config) -> InterstoveClimate:
+    """Crée une entité climate connectée au bridge simulé."""
+    config.setdefault(CONF_DELAI_RALLUMAGE, bridge.delai_rallumage)
+    return creer_poele(**{CONF_PORT: bridge.port, **config})
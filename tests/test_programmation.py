@@ -0,0 +1,187 @@
+"""Tests du programme hebdomadaire et du calcul des transitions."""
+
+from __future__ import annotations
+
+import datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+from hypothesis import given, strategies as st
+
+from custom_components.interstove.programmation import (
+    MINUTES_JOUR,
+    Programme,
+    parser_programme,
+)
+
+PRESETS = ["comfort", "eco", "away"]
+PARIS = ZoneInfo("Europe/Paris")
+
+SEMAINE = (
+    "mon-fri 06:30 comfort; mon-fri 22:00 eco\n"
+    "sat,sun 08:00 comfort; sat,sun 23:00 eco"
+)
+
+
+def test_parser_programme() -> None:
+    """Plages de jours, listes et séparateurs ; et retour à la ligne."""
+    transitions = parser_programme(SEMAINE, PRESETS)
+
+    assert len(transitions) == 14
+    assert transitions[0] == (6 * 60 + 30, "comfort")
+    assert transitions[-1] == (6 * MINUTES_JOUR + 23 * 60, "eco")
+    assert transitions == sorted(transitions)
+
+
+def test_parser_programme_plage_sur_fin_de_semaine() -> None:
+    """« sat-mon » couvre samedi, dimanche et lundi."""
+    transitions = parser_programme("sat-mon 07:00 comfort", PRESETS)
+
+    assert [minute // MINUTES_JOUR for minute, _ in transitions] == [0, 5, 6]
+
+
+def test_parser_programme_derniere_entree_prioritaire() -> None:
+    """Deux entrées à la même minute : la dernière l'emporte."""
+    assert parser_programme("mon 07:00 eco; mon 07:00 comfort", PRESETS) == [
+        (7 * 60, "comfort")
+    ]
+
+
+def test_parser_programme_vide() -> None:
+    assert parser_programme("", PRESETS) == []
+    assert not Programme(parser_programme(" ; \n", PRESETS))
+
+
+@pytest.mark.parametrize(
+    "texte",
+    [
+        "mon 6:3 comfort",
+        "mon 07:+5 comfort",
+        "mon 07:5 comfort",
+        "mon 24:00 comfort",
+        "mon 07:60 comfort",
+        "mon ０７:００ comfort",
+        "mon 07:00",
+        "mon 07:00 comfort extra",
+        "xyz 07:00 comfort",
+        "mon-xyz 07:00 comfort",
+        "mon 07:00 boost",
+    ],
+)
+def test_parser_programme_invalide(texte: str) -> None:
+    with pytest.raises(ValueError):
+        parser_programme(texte, PRESETS)
+
+
+@given(st.text(max_size=40))
+def test_parser_programme_ne_leve_que_value_error(texte: str) -> None:
+    """Un texte quelconque est accepté ou rejeté par ValueError."""
+    try:
+        transitions = parser_programme(texte, PRESETS)
+    except ValueError:
+        return
+    for minute, preset in transitions:
+        assert 0 <= minute < 7 * MINUTES_JOUR
+        assert preset in PRESETS
+
+
+def test_preset_actif() -> None:
+    programme = Programme(parser_programme(SEMAINE, PRESETS))
+
+    # Lundi 19 octobre 2026
+    assert programme.preset_actif(datetime.datetime(2026, 10, 19, 12, 0)) == "comfort"
+    assert programme.preset_actif(datetime.datetime(2026, 10, 19, 6, 30)) == "comfort"
+    assert programme.preset_actif(datetime.datetime(2026, 10, 19, 6, 29)) == "eco"
+
+
+def test_preset_actif_avant_la_premiere_transition() -> None:
+    """Avant la première transition de la semaine, la dernière reste active."""
+    programme = Programme(parser_programme("wed 08:00 comfort; fri 20:00 away", PRESETS))
+
+    assert programme.preset_actif(datetime.datetime(2026, 10, 19, 0, 0)) == "away"
+
+
+def test_prochaine_transition() -> None:
+    programme = Programme(parser_programme(SEMAINE, PRESETS))
+    lundi_midi = datetime.datetime(2026, 10, 19, 12, 0)
+
+    assert programme.prochaine_transition(lundi_midi) == (
+        datetime.datetime(2026, 10, 19, 22, 0),
+        "eco",
+    )
+
+
+def test_prochaine_transition_strictement_posterieure() -> None:
+    """À l'heure exacte d'une transition, c'est la suivante qui est retournée."""
+    programme = Programme(parser_programme(SEMAINE, PRESETS))
+
+    assert programme.prochaine_transition(datetime.datetime(2026, 10, 19, 6, 30)) == (
+        datetime.datetime(2026, 10, 19, 22, 0),
+        "eco",
+    )
+
+
+def test_prochaine_transition_dimanche_vers_lundi() -> None:
+    """Après la dernière transition du dimanche, bouclage sur le lundi suivant."""
+    programme = Programme(parser_programme(SEMAINE, PRESETS))
+    dimanche_soir = datetime.datetime(2026, 10, 25, 23, 30)
+
+    assert programme.prochaine_transition(dimanche_soir) == (
+        datetime.datetime(2026, 10, 26, 6, 30),
+        "comfort",
+    )
+
+
+def test_prochaine_transition_changement_d_heure() -> None:
+    """Passage à l'heure d'hiver (25/10/2026) : l'heure locale est conservée."""
+    programme = Programme(parser_programme("sun 08:00 comfort", PRESETS))
+    samedi = datetime.datetime(2026, 10, 24, 12, 0, tzinfo=PARIS)
+
+    heure, preset = programme.prochaine_transition(samedi)
+
+    assert preset == "comfort"
+    assert (heure.date(), heure.hour, heure.minute) == (datetime.date(2026, 10, 25), 8, 0)
+    assert heure.utcoffset() == datetime.timedelta(hours=1)
+    assert samedi.utcoffset() == datetime.timedelta(hours=2)
+
+
+@given(
+    st.lists(
+        st.tuples(
+            st.integers(min_value=0, max_value=7 * MINUTES_JOUR - 1),
+            st.sampled_from(PRESETS),
+        ),
+        min_size=1,
+        max_size=20,
+    ),
+    st.datetimes(
+        min_value=datetime.datetime(2020, 1, 1),
+        max_value=datetime.datetime(2030, 1, 1),
+    ),
+)
+def test_prochaine_transition_par_recherche_exhaustive(transitions, instant) -> None:
+    """La recherche dichotomique donne la même transition qu'un parcours complet."""
+    transitions = sorted(dict(transitions).items())
+    programme = Programme(transitions)
+    debut_semaine = datetime.datetime.combine(
+        instant.date() - datetime.timedelta(days=instant.weekday()),
+        datetime.time(),
+    )
+    candidates = [
+        (debut_semaine + datetime.timedelta(weeks=semaine, minutes=minute), preset)
+        for semaine in (0, 1)
+        for minute, preset in transitions
+    ]
+    attendue = min(c for c in candidates if c[0] > instant)
+
+    assert programme.prochaine_transition(instant) == attendue
+
+    # Le preset actif est celui de la dernière transition passée
+    precedentes = [
+        (debut_semaine + datetime.timedelta(weeks=semaine, minutes=minute), preset)
+        for semaine in (-1, 0)
+        for minute, preset in transitions
+    ]
+    assert programme.preset_actif(instant) == max(
+        c for c in precedentes if c[0] <= instant
+    )[1]
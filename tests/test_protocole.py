@@ -0,0 +1,112 @@
+"""Tests de robustesse du décodage des réponses du poêle."""
+
+from __future__ import annotations
+
+import time
+
+from homeassistant.components.climate import HVACAction, HVACMode
+from hypothesis import given, strategies as st
+
+from custom_components.interstove.const import (
+    ACK,
+    ETAT_ALLUMAGE,
+    ETAT_ALLUME,
+    ETAT_ETEINT,
+    ETATS_REFROIDISSEMENT,
+    TEMP_PLAUSIBLE_MAX,
+    TEMP_PLAUSIBLE_MIN,
+)
+
+from .common import creer_poele, trame_temperature
+
+ETATS_CONNUS = [ETAT_ETEINT, ETAT_ALLUME, ETAT_ALLUMAGE, *ETATS_REFROIDISSEMENT]
+
+# Réponses telles que produites par _send_command : data.hex() d'au plus 10 octets
+trames_hex = st.binary(max_size=10).map(bytes.hex)
+trames_tronquees = st.builds(
+    lambda trame, fin: trame[:fin],
+    st.sampled_from(ETATS_CONNUS + [ACK, trame_temperature(23.3)]),
+    st.integers(min_value=0, max_value=8),
+)
+trames = st.one_of(trames_hex, trames_tronquees, st.text(max_size=20))
+
+
+@given(trames)
+def test_parse_temperature_ne_leve_jamais(reponse: str) -> None:
+    """Une trame quelconque laisse la température inchangée ou plausible."""
+    poele = creer_poele()
+    poele._current_temp = 21.5
+
+    poele._parse_temperature(reponse)
+
+    assert poele._current_temp == 21.5 or (
+        TEMP_PLAUSIBLE_MIN <= poele._current_temp <= TEMP_PLAUSIBLE_MAX
+    )
+
+
+@given(trames_tronquees)
+def test_parse_temperature_ignore_trame_tronquee(reponse: str) -> None:
+    """Une trame tronquée ne modifie jamais la température."""
+    poele = creer_poele()
+    poele._current_temp = 21.5
+
+    poele._parse_temperature(reponse[:7])
+
+    assert poele._current_temp == 21.5
+
+
+@given(st.floats(min_value=TEMP_PLAUSIBLE_MIN, max_value=TEMP_PLAUSIBLE_MAX))
+def test_parse_temperature_valeur_valide(temperature: float) -> None:
+    """Une trame valide est décodée au dixième de degré."""
+    poele = creer_poele()
+
+    poele._parse_temperature(trame_temperature(temperature))
+
+    assert poele._current_temp == round(round(temperature * 10) / 10, 1)
+
+
+@given(st.lists(trames, max_size=10))
+def test_parse_statut_ne_leve_jamais(reponses: list[str]) -> None:
+    """Une suite de statuts quelconques garde un état HA cohérent."""
+    poele = creer_poele()
+
+    for reponse in reponses:
+        poele._parse_statut(reponse)
+
+        assert poele._etat_poele == reponse
+        assert poele._hvac_mode in (HVACMode.HEAT, HVACMode.OFF)
+        assert poele._hvac_action in (
+            HVACAction.OFF,
+            HVACAction.HEATING,
+            HVACAction.PREHEATING,
+            HVACAction.COOLING,
+        )
+
+
+def test_parse_statut_trame_inconnue_ne_relance_pas_le_delai() -> None:
+    """Une trame parasite pendant le refroidissement garde l'heure d'extinction."""
+    poele = creer_poele()
+    poele._parse_statut(ETAT_ALLUME)
+    poele._parse_statut(ETATS_REFROIDISSEMENT[0])
+    heure_extinction = poele._heure_extinction
+
+    poele._parse_statut("ffff")
+    poele._parse_statut(ETATS_REFROIDISSEMENT[1])
+
+    assert heure_extinction is not None
+    assert poele._heure_extinction == heure_extinction
+
+
+def test_cout_parsing_par_trame() -> None:
+    """Le décodage d'une trame reste bien en deçà du cycle de mise à jour."""
+    poele = creer_poele()
+    reponses = [trame_temperature(15 + i % 100 / 10) for i in range(10_000)]
+    statuts = [ETATS_CONNUS[i % len(ETATS_CONNUS)] for i in range(10_000)]
+
+    debut = time.perf_counter()
+    for reponse, statut in zip(reponses, statuts):
+        poele._parse_temperature(reponse)
+        poele._parse_statut(statut)
+    par_trame = (time.perf_counter() - debut) / len(reponses)
+
+    assert par_trame < 50e-6
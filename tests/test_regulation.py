@@ -0,0 +1,186 @@
+"""Tests de la régulation de puissance, seule et contre un bridge simulé."""
+
+from __future__ import annotations
+
+import asyncio
+import datetime
+
+from homeassistant.components.climate import HVACMode
+from hypothesis import given, settings, strategies as st
+
+from custom_components.interstove.const import (
+    CMD_ALLUMAGE,
+    CONF_PUISSANCE_MAX,
+    CONF_PUISSANCE_MIN,
+    ETAT_ALLUME,
+    ETAT_ETEINT,
+    ETATS_REFROIDISSEMENT,
+)
+
+from .common import FauxBridge, creer_poele, creer_poele_bridge
+
+# Lecture statut + lecture température + une commande de régulation
+COMMANDES_MAX_PAR_CYCLE = 3
+
+
+@st.composite
+def plages_puissance(draw) -> tuple[int, int]:
+    puissance_min = draw(st.integers(min_value=1, max_value=5))
+    puissance_max = draw(st.integers(min_value=puissance_min, max_value=5))
+    return puissance_min, puissance_max
+
+
+@given(plages_puissance(), st.floats())
+def test_calculer_puissance_dans_les_bornes(plage, ecart: float) -> None:
+    """La puissance calculée reste dans [puissance_min, puissance_max]."""
+    puissance_min, puissance_max = plage
+    poele = creer_poele(
+        **{CONF_PUISSANCE_MIN: puissance_min, CONF_PUISSANCE_MAX: puissance_max}
+    )
+
+    assert puissance_min <= poele._calculer_puissance(ecart) <= puissance_max
+
+
+@given(plages_puissance(), st.floats(-10, 10), st.floats(-10, 10))
+def test_calculer_puissance_croissante(plage, ecart_a: float, ecart_b: float) -> None:
+    """Un écart plus grand ne réduit jamais la puissance."""
+    puissance_min, puissance_max = plage
+    poele = creer_poele(
+        **{CONF_PUISSANCE_MIN: puissance_min, CONF_PUISSANCE_MAX: puissance_max}
+    )
+    bas, haut = sorted((ecart_a, ecart_b))
+
+    assert poele._calculer_puissance(bas) <= poele._calculer_puissance(haut)
+
+
+def test_pas_d_allumage_pendant_le_delai() -> None:
+    """Poêle éteint par HA : pas de rallumage avant la fin du délai."""
+
+    async def scenario() -> FauxBridge:
+        async with FauxBridge(delai_rallumage=1800) as bridge:
+            bridge.temperature = 15.0
+            poele = creer_poele_bridge(bridge)
+            poele._heure_extinction = datetime.datetime.now()
+
+            await poele.async_update()
+            # Régulation déclenchée par un changement de consigne
+            await poele._reguler_puissance()
+            return bridge
+
+    bridge = asyncio.run(scenario())
+
+    assert CMD_ALLUMAGE not in bridge.commandes
+    assert bridge.statut == ETAT_ETEINT
+    assert len(bridge.commandes) <= COMMANDES_MAX_PAR_CYCLE
+
+
+def test_allumage_apres_le_delai() -> None:
+    """Délai écoulé et consigne non atteinte : un seul allumage."""
+
+    async def scenario() -> FauxBridge:
+        async with FauxBridge(delai_rallumage=1800) as bridge:
+            bridge.temperature = 15.0
+            poele = creer_poele_bridge(bridge)
+            poele._heure_extinction = datetime.datetime.now() - datetime.timedelta(
+                seconds=1801
+            )
+
+            await poele.async_update()
+            # Régulation déclenchée par un changement de consigne
+            await poele._reguler_puissance()
+            return bridge
+
+    bridge = asyncio.run(scenario())
+
+    assert bridge.commandes.count(CMD_ALLUMAGE) == 1
+    assert len(bridge.commandes) <= COMMANDES_MAX_PAR_CYCLE
+
+
+def test_puissance_manuelle_poele_arrete() -> None:
+    """Puissance 1 demandée pendant le refroidissement : aucune trame d'allumage."""
+
+    async def scenario() -> tuple[FauxBridge, int, str]:
+        async with FauxBridge(delai_rallumage=1800) as bridge:
+            bridge.statut = ETAT_ALLUME
+            poele = creer_poele_bridge(bridge)
+            await poele.async_update()
+
+            await poele.async_set_hvac_mode(HVACMode.OFF)
+            await poele.async_update()
+            avant = len(bridge.commandes)
+
+            await poele.async_set_fan_mode("1")
+            return bridge, avant, poele.fan_mode
+
+    bridge, avant, fan_mode = asyncio.run(scenario())
+
+    assert bridge.commandes[avant:] == []
+    assert bridge.violations == 0
+    assert bridge.statut in ETATS_REFROIDISSEMENT
+    assert fan_mode == "1"
+
+
+def test_puissance_manuelle_poele_en_marche() -> None:
+    """Poêle en marche : la puissance demandée est envoyée, bornée."""
+
+    async def scenario() -> FauxBridge:
+        async with FauxBridge() as bridge:
+            bridge.statut = ETAT_ALLUME
+            bridge.temperature = 20.0
+            poele = creer_poele_bridge(
+                bridge, **{CONF_PUISSANCE_MIN: 2, CONF_PUISSANCE_MAX: 4}
+            )
+            await poele.async_update()
+
+            await poele.async_set_fan_mode("5")
+            await poele.async_set_fan_mode("1")
+            return bridge
+
+    bridge = asyncio.run(scenario())
+
+    assert bridge.puissances[-2:] == [4, 2]
+
+
+@settings(max_examples=50, deadline=None)
+@given(
+    st.lists(st.floats(min_value=5, max_value=35), min_size=1, max_size=20),
+    st.floats(min_value=15, max_value=30),
+    plages_puissance(),
+)
+def test_sequence_temperatures(temperatures, consigne, plage) -> None:
+    """
+    Sur une suite de températures quelconque : nombre de commandes borné
+    par cycle, aucun rallumage pendant le délai, puissance dans les bornes.
+    """
+    puissance_min, puissance_max = plage
+
+    async def scenario() -> None:
+        async with FauxBridge(delai_rallumage=1800) as bridge:
+            poele = creer_poele_bridge(
+                bridge,
+                **{
+                    CONF_PUISSANCE_MIN: puissance_min,
+                    CONF_PUISSANCE_MAX: puissance_max,
+                },
+            )
+            poele._target_temp = consigne
+
+            for temperature in temperatures:
+                bridge.temperature = temperature
+                avant = len(bridge.commandes)
+
+                await poele.async_update()
+                await poele._reguler_puissance()
+
+                # async_update et une régulation supplémentaire (changement de consigne)
+                assert len(bridge.commandes) - avant <= COMMANDES_MAX_PAR_CYCLE + 1
+                assert bridge.violations == 0
+                assert poele.available
+
+            # Puissances réellement envoyées au poêle en marche
+            assert all(
+                puissance_min <= puissance <= puissance_max
+                for puissance in bridge.puissances
+            )
+
+    asyncio.run(scenario())
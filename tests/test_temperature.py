@@ -0,0 +1,70 @@
+"""Tests de l'agrégation de température multi-pièces."""
+
+from __future__ import annotations
+
+import datetime
+import math
+
+from hypothesis import given, strategies as st
+
+from custom_components.interstove.temperature import AgregateurTemperature
+
+DEBUT = datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc)
+ENTITES = ["sensor.salon", "sensor.chambre", "sensor.bureau"]
+
+valeurs = st.one_of(
+    st.none(),
+    st.floats(min_value=-50, max_value=50),
+    st.sampled_from([math.nan, math.inf, -math.inf]),
+)
+mises_a_jour = st.lists(
+    st.tuples(
+        st.sampled_from(ENTITES),
+        valeurs,
+        st.integers(min_value=0, max_value=3600),
+    ),
+    max_size=30,
+)
+
+
+@given(mises_a_jour)
+def test_moyenne_incrementale_egale_recalcul(evenements) -> None:
+    """La moyenne glissante vaut la moyenne recalculée des sondes valides."""
+    poids = {"sensor.salon": 2.0, "sensor.chambre": 1.0, "sensor.bureau": 0.5}
+    agregateur = AgregateurTemperature(poids, age_max=600)
+    dernieres: dict[str, tuple[float, datetime.datetime]] = {}
+
+    for entity_id, valeur, secondes in sorted(evenements, key=lambda e: e[2]):
+        horodatage = DEBUT + datetime.timedelta(seconds=secondes)
+        agregateur.mettre_a_jour(entity_id, valeur, horodatage)
+        dernieres.pop(entity_id, None)
+        if valeur is not None and math.isfinite(valeur):
+            dernieres[entity_id] = (valeur, horodatage)
+
+    maintenant = DEBUT + datetime.timedelta(seconds=3600)
+    valides = {
+        entity_id: valeur
+        for entity_id, (valeur, horodatage) in dernieres.items()
+        if maintenant - horodatage <= datetime.timedelta(seconds=600)
+    }
+    temperature = agregateur.temperature(maintenant)
+
+    if not valides:
+        assert temperature is None
+    else:
+        attendue = sum(v * poids[e] for e, v in valides.items()) / sum(
+            poids[e] for e in valides
+        )
+        assert math.isclose(temperature, attendue, abs_tol=0.051)
+
+
+def test_valeur_non_finie_ignoree() -> None:
+    """Une sonde nan est traitée comme indisponible, sans polluer la moyenne."""
+    agregateur = AgregateurTemperature({"a": 1.0, "b": 1.0}, age_max=600)
+
+    agregateur.mettre_a_jour("a", 20.0, DEBUT)
+    agregateur.mettre_a_jour("b", float("nan"), DEBUT)
+    assert agregateur.temperature(DEBUT) == 20.0
+
+    agregateur.mettre_a_jour("b", 21.0, DEBUT)
+    assert agregateur.temperature(DEBUT) == 20.5